@@ -2,8 +2,69 @@
 Document data model for ADF
 """
 
+import functools
 import json
-from typing import Any, Optional, Union
+import re
+import sys
+from typing import Any, Optional, Sequence, Union
+
+# A path segment is a run of quoted spans (an unterminated quote runs to the
+# end of the path) and characters other than "." and '"'. Dots inside quotes
+# do not split, and empty segments are skipped.
+_PATH_SEGMENT_RE = re.compile(r'(?:"[^"]*"?|[^."])+')
+
+# Sentinel for get() cache misses, since None is a valid value
+_MISS = object()
+
+# Upper bound on cached get() results per document
+_GET_CACHE_SIZE = 4096
+
+# Values copied by _copy_tree rather than shared
+_CONTAINER_TYPES = (dict, list)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_path_cached(path: str) -> tuple[str, ...]:
+    """
+    Parse a dot-notation path into parts, memoized per path string.
+
+    Paths are re-read on every get/set, so repeated lookups of the same
+    path skip the parse entirely. The cache is bounded to avoid unbounded
+    growth with generated paths. Parts are interned so the dict keys they
+    probe compare by identity.
+    """
+    if not path:
+        return ()
+
+    # Fast path: no quoted keys, so a plain split is enough
+    if '"' not in path:
+        return tuple(sys.intern(part) for part in path.split(".") if part)
+
+    return tuple(sys.intern(_unquote_key(part)) for part in _PATH_SEGMENT_RE.findall(path))
+
+
+def _unquote_key(key: str) -> str:
+    """Remove quotes from a quoted key"""
+    if key.startswith('"') and key.endswith('"'):
+        return key[1:-1]
+    return key
+
+
+def _copy_tree(obj: Any) -> Any:
+    """
+    Deep copy the dicts and lists of a document tree.
+
+    Other values are shared, as they are stored. Leaves are not passed
+    through a call, which keeps wide sections and scalar arrays cheap.
+    """
+    if isinstance(obj, dict):
+        return {
+            key: _copy_tree(value) if isinstance(value, _CONTAINER_TYPES) else value
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_copy_tree(item) if isinstance(item, _CONTAINER_TYPES) else item for item in obj]
+    return obj
 
 
 class Document:
@@ -17,6 +78,8 @@ class Document:
     def __init__(self) -> None:
         self._root: dict[str, Any] = {}
         self._relative_sections: dict[str, Any] = {}
+        # Resolved get() results by path; cleared whenever the tree changes
+        self._get_cache: dict[str, Any] = {}
 
     def get(self, path: str, default: Any = None) -> Any:
         """
@@ -28,10 +91,18 @@ class Document:
 
         Returns:
             The value at the path, or default if not found
+
+        Lookups are cached until the next set/merge, so containers returned
+        by get() should be changed through those methods rather than
+        mutated directly.
         """
         if not path:
             return self._root
 
+        cached = self._get_cache.get(path, _MISS)
+        if cached is not _MISS:
+            return cached
+
         parts = self._parse_path(path)
         current = self._root
 
@@ -41,6 +112,9 @@ class Document:
             else:
                 return default
 
+        if len(self._get_cache) >= _GET_CACHE_SIZE:
+            self._get_cache.clear()
+        self._get_cache[path] = current
         return current
 
     def set(self, path: str, value: Any) -> None:
@@ -53,23 +127,43 @@ class Document:
         """
         if not path:
             if isinstance(value, dict):
+                self._get_cache.clear()
                 self._root = value
             return
 
         parts = self._parse_path(path)
-        current = self._root
+        self._set_parsed(parts, value)
 
-        # Navigate to parent, creating dicts as needed
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            elif not isinstance(current[part], dict):
-                # Overwrite non-dict with dict
-                current[part] = {}
-            current = current[part]
+    def _set_parsed(self, parts: Sequence[str], value: Any) -> None:
+        """
+        Set a value by an already-split, non-empty path.
+
+        Args:
+            parts: Path parts (e.g., ("person", "name"))
+            value: Value to set
+        """
+        self._get_cache.clear()
+        self._container(parts[:-1])[parts[-1]] = value
+
+    def _container(self, parts: Sequence[str]) -> dict[str, Any]:
+        """
+        Walk an already-split path from the root, creating dicts as needed.
 
-        # Set the final value
-        current[parts[-1]] = value
+        Args:
+            parts: Path parts; empty for the root
+
+        Returns:
+            The dict at the end of the path
+        """
+        current = self._root
+        for part in parts:
+            child = current.get(part)
+            if not isinstance(child, dict):
+                # Create missing parents, overwriting non-dicts
+                child = {}
+                current[part] = child
+            current = child
+        return current
 
     def merge(self, other: "Document") -> None:
         """
@@ -79,29 +173,50 @@ class Document:
         Objects are merged recursively.
         Arrays are replaced (not appended).
 
+        The merge happens in place. Values taken from other are shared
+        rather than copied, so other is consumed by the merge: it should
+        not be used or modified afterwards.
+
         Args:
             other: Document to merge from
         """
-        self._root = self._deep_merge(self._root, other._root)
+        self._get_cache.clear()
+        self._deep_merge(self._root, other._root)
 
     def merge_at_path(self, path: str, data: Any) -> None:
         """
         Merge data at a specific path.
 
+        As with merge(), values from data are stored by reference rather
+        than copied, so data is consumed: it should not be used or modified
+        afterwards.
+
         Args:
             path: Where to merge the data
             data: Data to merge
         """
-        existing = self.get(path, {})
-        if isinstance(existing, dict) and isinstance(data, dict):
-            merged = self._deep_merge(existing, data)
-            self.set(path, merged)
-        else:
+        if not isinstance(data, dict):
             self.set(path, data)
+            return
+
+        # Walk to the parent once; a missing or non-dict target takes data
+        # as-is, so its keys are not re-inserted one by one
+        self._get_cache.clear()
+        parts = self._parse_path(path)
+        if not parts:
+            self._deep_merge(self._root, data)
+            return
+
+        parent = self._container(parts[:-1])
+        existing = parent.get(parts[-1])
+        if isinstance(existing, dict):
+            self._deep_merge(existing, data)
+        else:
+            parent[parts[-1]] = data
 
     def to_dict(self) -> dict[str, Any]:
         """Convert document to a dictionary"""
-        return self._deep_copy(self._root)
+        return _copy_tree(self._root)
 
     def to_json(self, indent: Optional[int] = 2) -> str:
         """
@@ -117,7 +232,7 @@ class Document:
 
     def get_relative_sections(self) -> dict[str, Any]:
         """Get all relative sections (relocatable fragments)"""
-        return self._deep_copy(self._relative_sections)
+        return _copy_tree(self._relative_sections)
 
     def add_relative_section(self, path: str, data: Any) -> None:
         """
@@ -140,74 +255,34 @@ class Document:
         else:
             current[parts[-1]] = data
 
-    def _parse_path(self, path: str) -> list[str]:
+    def _parse_path(self, path: str) -> tuple[str, ...]:
         """
         Parse a dot-notation path into parts.
 
         Handles quoted keys like "Some Key".subkey
         """
-        if not path:
-            return []
-
-        parts = []
-        current = ""
-        in_quotes = False
-
-        i = 0
-        while i < len(path):
-            char = path[i]
-
-            if char == '"':
-                in_quotes = not in_quotes
-                current += char
-            elif char == "." and not in_quotes:
-                if current:
-                    parts.append(self._unquote_key(current))
-                    current = ""
-            else:
-                current += char
+        return _parse_path_cached(path)
 
-            i += 1
-
-        if current:
-            parts.append(self._unquote_key(current))
-
-        return parts
-
-    def _unquote_key(self, key: str) -> str:
-        """Remove quotes from a quoted key"""
-        if key.startswith('"') and key.endswith('"'):
-            return key[1:-1]
-        return key
-
-    def _deep_merge(self, base: Any, overlay: Any) -> Any:
+    def _deep_merge(self, base: dict[str, Any], overlay: dict[str, Any]) -> dict[str, Any]:
         """
-        Recursively merge two values.
+        Merge overlay into base in place and return base.
 
         - Dicts are merged recursively
         - Lists are replaced (not merged)
         - Other types are replaced
+
+        Values from overlay are assigned by reference, not copied.
         """
-        if isinstance(base, dict) and isinstance(overlay, dict):
-            result = base.copy()
-            for key, value in overlay.items():
-                if key in result:
-                    result[key] = self._deep_merge(result[key], value)
+        stack = [(base, overlay)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                existing = target.get(key)
+                if isinstance(existing, dict) and isinstance(value, dict):
+                    stack.append((existing, value))
                 else:
-                    result[key] = self._deep_copy(value)
-            return result
-        else:
-            # Replace with overlay
-            return self._deep_copy(overlay)
-
-    def _deep_copy(self, obj: Any) -> Any:
-        """Deep copy an object"""
-        if isinstance(obj, dict):
-            return {k: self._deep_copy(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._deep_copy(item) for item in obj]
-        else:
-            return obj
+                    target[key] = value
+        return base
 
     def __repr__(self) -> str:
         return f"Document({self._root})"
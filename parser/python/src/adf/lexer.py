@@ -2,32 +2,99 @@
 Lexer for ADF format - handles line-level tokenization
 """
 
+import mmap
 import re
-from typing import Optional, Tuple
-from dataclasses import dataclass
-from enum import Enum
+import sys
+from typing import Iterator, Optional, Tuple, Union
+from enum import IntEnum
+
+# Byte buffers the lexer can read lines from
+BytesLike = Union[bytes, mmap.mmap]
+
+# Classifies a (non-multiline) line in one match. Alternatives are tried in
+# order, so a line ending in ":" is header-shaped even if it contains "=";
+# header paths are validated separately. No match means a scalar value.
+LINE_RE = re.compile(
+    r"(?P<blank>\s*$)"
+    r"|\s*#(?P<abspath>.*):\s*$"
+    r"|(?P<relpath>.*):\s*$"
+    r"|(?P<key_value>[^=]*=)"
+)
+
+# A whole dotted path: plain components ([A-Za-z0-9_]+) or quoted components
+# (simplified - no dots or quotes inside the quotes)
+FULL_PATH_RE = re.compile(
+    r'(?:[A-Za-z0-9_]+|"[^".]+")(?:\.(?:[A-Za-z0-9_]+|"[^".]+"))*'
+)
+
+# The span from the last "(" to the last ")" in a value (nothing but text
+# without parentheses may follow it)
+CONSTRAINT_RE = re.compile(r"\(([^(]*)\)[^()]*$")
+
+# One line plus its terminator, using the same boundaries as str.splitlines()
+_LINE_SPLIT_RE = re.compile(
+    "([^\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]*)"
+    "(\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029])?"
+)
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text lazily, like an on-demand str.splitlines()"""
+    for match in _LINE_SPLIT_RE.finditer(text):
+        line, terminator = match.groups()
+        if terminator or line:
+            yield line
+
+
+def _iter_byte_lines(data: BytesLike) -> Iterator[str]:
+    """
+    Yield the lines of UTF-8 encoded data lazily, decoding one line at a time.
+
+    Line boundaries match str.splitlines() on the decoded text.
+    """
+    start = 0
+    size = len(data)
+    while start < size:
+        end = data.find(b"\n", start)
+        if end == -1:
+            # Last line, without a terminator
+            yield from _iter_lines(data[start:].decode("utf-8"))
+            return
+        # Keep the "\n" so "\r\n" and other boundaries split as in the text
+        yield from _iter_lines(data[start : end + 1].decode("utf-8"))
+        start = end + 1
+
+
+class LineType(IntEnum):
+    """
+    Types of lines in ADF.
+
+    Each type is a distinct bit, so groups of types can be tested with a
+    single integer mask (IntEnum keeps "&" on the C-level int fast path).
+    """
+
+    BLANK = 1
+    ABSOLUTE_HEADER = 2
+    RELATIVE_HEADER = 4
+    KEY_VALUE = 8
+    SCALAR_VALUE = 16
+    MULTILINE_START = 32
+    MULTILINE_CONTENT = 64
+    MULTILINE_END = 128
 
 
-class LineType(Enum):
-    """Types of lines in ADF"""
-
-    BLANK = "blank"
-    ABSOLUTE_HEADER = "absolute_header"
-    RELATIVE_HEADER = "relative_header"
-    KEY_VALUE = "key_value"
-    SCALAR_VALUE = "scalar_value"
-    MULTILINE_START = "multiline_start"
-    MULTILINE_CONTENT = "multiline_content"
-    MULTILINE_END = "multiline_end"
+class Token:
+    """
+    Base class for a parsed line.
 
+    Each line type has its own subclass holding only the fields it uses;
+    fields a token type does not have read as None.
+    """
 
-@dataclass
-class Token:
-    """Represents a parsed line"""
+    # Slots instead of a per-instance __dict__: one token is built per line
+    __slots__ = ("line_number", "raw_line")
 
     line_type: LineType
-    line_number: int
-    raw_line: str
 
     # For headers
     path: Optional[str] = None
@@ -41,30 +108,139 @@ class Token:
     # For multiline tracking
     quote_count: Optional[int] = None
 
+    def __init__(self, line_number: int, raw_line: str) -> None:
+        self.line_number = line_number
+        self.raw_line = raw_line
+
+
+class BlankToken(Token):
+    """A blank line"""
+
+    __slots__ = ()
+    line_type = LineType.BLANK
+
+
+class HeaderToken(Token):
+    """An absolute or relative section header"""
+
+    __slots__ = ("line_type", "path", "is_absolute")
+
+    def __init__(self, line_number: int, raw_line: str, path: str, is_absolute: bool) -> None:
+        self.line_number = line_number
+        self.raw_line = raw_line
+        self.line_type = LineType.ABSOLUTE_HEADER if is_absolute else LineType.RELATIVE_HEADER
+        self.path = path
+        self.is_absolute = is_absolute
+
+
+class KeyValueToken(Token):
+    """A single-line key = value pair"""
+
+    __slots__ = ("key", "value", "constraint")
+    line_type = LineType.KEY_VALUE
+
+    def __init__(
+        self, line_number: int, raw_line: str, key: str, value: str, constraint: Optional[str]
+    ) -> None:
+        self.line_number = line_number
+        self.raw_line = raw_line
+        self.key = key
+        self.value = value
+        self.constraint = constraint
+
+
+class ScalarToken(Token):
+    """A bare value line (scalar array element)"""
+
+    __slots__ = ("value",)
+    line_type = LineType.SCALAR_VALUE
+
+    def __init__(self, line_number: int, raw_line: str, value: str) -> None:
+        self.line_number = line_number
+        self.raw_line = raw_line
+        self.value = value
+
+
+class MultilineStartToken(Token):
+    """A key = value line that opens a multiline value"""
+
+    __slots__ = ("key", "value", "quote_count")
+    line_type = LineType.MULTILINE_START
+
+    def __init__(
+        self, line_number: int, raw_line: str, key: str, value: str, quote_count: int
+    ) -> None:
+        self.line_number = line_number
+        self.raw_line = raw_line
+        self.key = key
+        self.value = value
+        self.quote_count = quote_count
+
+
+class MultilineContentToken(Token):
+    """A line inside a multiline value"""
+
+    __slots__ = ("value",)
+    line_type = LineType.MULTILINE_CONTENT
+
+    def __init__(self, line_number: int, raw_line: str, value: str) -> None:
+        self.line_number = line_number
+        self.raw_line = raw_line
+        self.value = value
+
+
+class MultilineEndToken(Token):
+    """The line that closes a multiline value"""
+
+    __slots__ = ("value", "constraint")
+    line_type = LineType.MULTILINE_END
+
+    def __init__(
+        self, line_number: int, raw_line: str, value: str, constraint: Optional[str]
+    ) -> None:
+        self.line_number = line_number
+        self.raw_line = raw_line
+        self.value = value
+        self.constraint = constraint
+
 
 class Lexer:
     """Tokenizes ADF text line by line"""
 
-    # Pattern for valid path/key components
-    KEY_PATTERN = re.compile(r'^[A-Za-z0-9_]+$')
-
-    # Pattern for quoted keys (simplified - handles basic quoted keys)
-    QUOTED_KEY_PATTERN = re.compile(r'^"([^"]+)"$')
+    # Precomputed quote delimiters for the common single/triple quote cases
+    _Q1 = '"'
+    _Q3 = '"""'
 
     def __init__(self, text: str, strict: bool = False):
-        self.lines = text.splitlines()
+        self.lines: Iterator[str] = _iter_lines(text)
         self.strict = strict
         self.in_multiline = False
         self.multiline_quote_count = 0
 
-    def tokenize(self) -> list[Token]:
-        """Tokenize all lines"""
-        tokens = []
+    def tokenize(self) -> Iterator[Token]:
+        """Tokenize lines lazily, yielding one token per line"""
+        # Bind hot-loop lookups locally to skip repeated attribute access
+        tokenize_line = self._tokenize_line
         for i, line in enumerate(self.lines, start=1):
-            token = self._tokenize_line(line, i)
+            token = tokenize_line(line, i)
             if token:
-                tokens.append(token)
-        return tokens
+                yield token
+
+    @classmethod
+    def from_bytes(cls, data: BytesLike, strict: bool = False) -> "Lexer":
+        """
+        Create a lexer over UTF-8 encoded data.
+
+        Lines are decoded as they are tokenized, so data can be a memory
+        mapped file that is never decoded as a whole.
+
+        Args:
+            data: UTF-8 encoded ADF (bytes or mmap)
+            strict: Strict parsing mode
+        """
+        lexer = cls("", strict=strict)
+        lexer.lines = _iter_byte_lines(data)
+        return lexer
 
     def _tokenize_line(self, line: str, line_number: int) -> Optional[Token]:
         """Tokenize a single line"""
@@ -73,52 +249,51 @@ class Lexer:
         if self.in_multiline:
             return self._handle_multiline_continuation(line, line_number)
 
-        # Check for blank line
-        if not line.strip():
-            return Token(
-                line_type=LineType.BLANK,
-                line_number=line_number,
-                raw_line=line,
-            )
+        # Classify the line with a single match
+        match = LINE_RE.match(line)
+        if match is not None:
+            kind = match.lastgroup
 
-        # Check for header (absolute or relative)
-        header_token = self._try_parse_header(line, line_number)
-        if header_token:
-            return header_token
+            # Check for blank line
+            if kind == "blank":
+                return BlankToken(
+                    line_number=line_number,
+                    raw_line=line,
+                )
 
-        # Check for key-value pair
-        if "=" in line:
-            return self._parse_key_value(line, line_number)
+            # Check for key-value pair
+            if kind == "key_value":
+                return self._parse_key_value(line, line_number)
+
+            # Otherwise it's a header (absolute or relative)
+            is_absolute = kind == "abspath"
+            header_token = self._try_parse_header(
+                line, line_number, match.group("abspath" if is_absolute else "relpath"), is_absolute
+            )
+            if header_token:
+                return header_token
+
+            # Header-shaped line with an invalid path
+            if "=" in line:
+                return self._parse_key_value(line, line_number)
 
         # Otherwise, it's a scalar value
-        return Token(
-            line_type=LineType.SCALAR_VALUE,
+        return ScalarToken(
             line_number=line_number,
             raw_line=line,
             value=line.strip(),
         )
 
-    def _try_parse_header(self, line: str, line_number: int) -> Optional[Token]:
-        """Try to parse line as a header"""
-        stripped = line.strip()
-
-        if not stripped.endswith(":"):
-            return None
-
-        # Remove trailing colon
-        path_part = stripped[:-1].strip()
-
-        # Check if absolute (starts with #)
-        is_absolute = False
-        if path_part.startswith("#"):
-            is_absolute = True
-            path_part = path_part[1:].strip()
+    def _try_parse_header(
+        self, line: str, line_number: int, path_part: str, is_absolute: bool
+    ) -> Optional[Token]:
+        """Try to build a header token from a header-shaped line"""
+        path_part = path_part.strip()
 
         # Special case: root section (#:)
         if not path_part:
             if is_absolute:
-                return Token(
-                    line_type=LineType.ABSOLUTE_HEADER,
+                return HeaderToken(
                     line_number=line_number,
                     raw_line=line,
                     path="",
@@ -132,32 +307,29 @@ class Lexer:
         if not self._is_valid_path(path_part):
             return None
 
-        return Token(
-            line_type=LineType.ABSOLUTE_HEADER if is_absolute else LineType.RELATIVE_HEADER,
+        return HeaderToken(
             line_number=line_number,
             raw_line=line,
-            path=path_part,
+            path=sys.intern(path_part),
             is_absolute=is_absolute,
         )
 
     def _parse_key_value(self, line: str, line_number: int) -> Token:
         """Parse a key=value line"""
-        # Find first = that's not in a quote block
-        equals_pos = line.find("=")
-        if equals_pos == -1:
+        # Split at the first =
+        raw_key, sep, raw_value = line.partition("=")
+        if not sep:
             # Should not happen, but handle gracefully
-            return Token(
-                line_type=LineType.SCALAR_VALUE,
+            return ScalarToken(
                 line_number=line_number,
                 raw_line=line,
                 value=line.strip(),
             )
 
-        raw_key = line[:equals_pos].strip()
-        raw_value = line[equals_pos + 1 :].lstrip()
-
-        # Parse key (may include dots for nested paths)
-        key = self._parse_key(raw_key)
+        # Key may include dots for nested paths, and may be quoted
+        # Interned: the same keys recur across sections and records
+        key = sys.intern(raw_key.strip())
+        raw_value = raw_value.lstrip()
 
         # Check if value starts a multiline block
         quote_count = self._count_leading_quotes(raw_value)
@@ -176,8 +348,7 @@ class Lexer:
                 self.in_multiline = False
                 value = self._extract_quoted_value(raw_value, quote_count)
                 constraint = self._extract_constraint(raw_value, quote_count)
-                return Token(
-                    line_type=LineType.KEY_VALUE,
+                return KeyValueToken(
                     line_number=line_number,
                     raw_line=line,
                     key=key,
@@ -187,8 +358,7 @@ class Lexer:
             else:
                 # Multiline start
                 content = raw_value[quote_count:]
-                return Token(
-                    line_type=LineType.MULTILINE_START,
+                return MultilineStartToken(
                     line_number=line_number,
                     raw_line=line,
                     key=key,
@@ -199,8 +369,7 @@ class Lexer:
         # Simple value (possibly with constraint)
         value, constraint = self._parse_value_and_constraint(raw_value)
 
-        return Token(
-            line_type=LineType.KEY_VALUE,
+        return KeyValueToken(
             line_number=line_number,
             raw_line=line,
             key=key,
@@ -217,8 +386,7 @@ class Lexer:
             content = line[: -self.multiline_quote_count].rstrip()
             # Look for constraint after the quotes
             constraint = self._extract_constraint_after_line(line, self.multiline_quote_count)
-            return Token(
-                line_type=LineType.MULTILINE_END,
+            return MultilineEndToken(
                 line_number=line_number,
                 raw_line=line,
                 value=content,
@@ -226,8 +394,7 @@ class Lexer:
             )
         else:
             # Content line
-            return Token(
-                line_type=LineType.MULTILINE_CONTENT,
+            return MultilineContentToken(
                 line_number=line_number,
                 raw_line=line,
                 value=line,
@@ -235,42 +402,20 @@ class Lexer:
 
     def _is_valid_path(self, path: str) -> bool:
         """Check if a path is valid"""
-        if not path:
-            return True  # Empty path is valid for root
-
-        parts = path.split(".")
-        for part in parts:
-            # Check for quoted key
-            quoted_match = self.QUOTED_KEY_PATTERN.match(part)
-            if quoted_match:
-                continue  # Quoted keys are valid
-
-            # Check regular key pattern
-            if not self.KEY_PATTERN.match(part):
-                return False
-        return True
-
-    def _parse_key(self, key: str) -> str:
-        """Parse and validate a key"""
-        # Keys can contain dots for nested paths
-        # Keys can be quoted
-        return key
+        # Empty path is valid for root
+        return not path or FULL_PATH_RE.fullmatch(path) is not None
 
     def _count_leading_quotes(self, s: str) -> int:
         """Count consecutive quotes at the start of string"""
-        count = 0
-        for char in s:
-            if char == '"':
-                count += 1
-            else:
-                break
-        return count
+        return len(s) - len(s.lstrip('"'))
 
     def _ends_with_quotes(self, s: str, count: int) -> bool:
         """Check if string ends with exactly 'count' quotes"""
-        if len(s) < count:
-            return False
-        return s[-count:] == '"' * count
+        if count == 1:
+            return s[-1:] == self._Q1
+        if count == 3:
+            return s.endswith(self._Q3)
+        return s.endswith('"' * count)
 
     def _extract_quoted_value(self, s: str, quote_count: int) -> str:
         """Extract value from within quotes"""
@@ -293,7 +438,7 @@ class Lexer:
             return None
 
         after_quotes = line[len(line) - quote_count :].strip()
-        if after_quotes.startswith('"'):
+        if after_quotes[:1] == '"':
             # Remove the quotes
             after_quotes = after_quotes[quote_count:].lstrip()
 
@@ -301,34 +446,22 @@ class Lexer:
 
     def _parse_value_and_constraint(self, s: str) -> Tuple[str, Optional[str]]:
         """Parse a value and optional constraint"""
-        # Look for constraint in parentheses
-        # Simple approach: find last (...)
-        constraint = self._parse_constraint(s)
-        if constraint:
-            # Remove constraint from value
-            paren_pos = s.rfind("(")
-            value = s[:paren_pos].rstrip()
-        else:
-            value = s.strip()
+        # Look for constraint in parentheses: the last (...) in the value
+        match = CONSTRAINT_RE.search(s)
+        if match:
+            constraint = match.group(1).strip()
+            if constraint:
+                # Remove constraint from value
+                return s[: match.start()].rstrip(), constraint
 
-        return value, constraint
+        return s.strip(), None
 
     def _parse_constraint(self, s: str) -> Optional[str]:
         """Extract constraint from string"""
-        s = s.strip()
-        if not s:
-            return None
-
-        # Find last opening parenthesis
-        open_paren = s.rfind("(")
-        if open_paren == -1:
-            return None
-
-        # Find matching closing parenthesis
-        close_paren = s.rfind(")")
-        if close_paren == -1 or close_paren < open_paren:
+        match = CONSTRAINT_RE.search(s)
+        if not match:
             return None
 
         # Extract constraint content
-        constraint = s[open_paren + 1 : close_paren].strip()
+        constraint = match.group(1).strip()
         return constraint if constraint else None
@@ -2,12 +2,38 @@
 Main ADF parser
 """
 
-from pathlib import Path
-from typing import Any, Optional
+import functools
+import mmap
+import os
+import re
+import stat
+import sys
+from typing import Any, Iterable, Optional
 from .lexer import Lexer, Token, LineType
 from .document import Document
 from .errors import ADFParseError
 
+# Line type masks
+_HEADER_MASK = LineType.ABSOLUTE_HEADER | LineType.RELATIVE_HEADER
+_CONTENT_MASK = LineType.KEY_VALUE | LineType.MULTILINE_START  # lines that start a key
+
+_BOOL_WORDS = {"true": True, "false": False}
+_BOOL_INITIALS = frozenset("tTfF")
+
+# float() also accepts "inf", "infinity" and "nan" in any case
+_NUMERIC_WORD_INITIALS = frozenset("iInN")
+
+# The strings int() and float() accept (surrounding whitespace, a sign, and
+# digit groups separated by single underscores), so only matches are converted.
+# They strip the whitespace \s matches except the separators \x1c-\x1f.
+_SPACE = r"[^\S\x1c-\x1f]*"
+_DIGITS = r"\d(?:_?\d)*"
+_INT_RE = re.compile(rf"{_SPACE}[-+]?{_DIGITS}{_SPACE}")
+_FLOAT_RE = re.compile(
+    rf"{_SPACE}[-+]?(?:(?:{_DIGITS}\.(?:{_DIGITS})?|\.{_DIGITS}|{_DIGITS})"
+    rf"(?:[eE][-+]?{_DIGITS})?|(?ai:inf|infinity|nan)){_SPACE}"
+)
+
 
 class Parser:
     """
@@ -42,45 +68,48 @@ class Parser:
         Raises:
             ADFParseError: If parsing fails in strict mode
         """
-        lexer = Lexer(text, strict=self.strict)
-        tokens = lexer.tokenize()
+        return self._parse_lexer(Lexer(text, strict=self.strict))
 
+    def _parse_lexer(self, lexer: Lexer) -> Document:
+        """Parse the tokens produced by lexer into a new Document"""
         document = Document()
-        self._parse_tokens(tokens, document)
+        self._parse_tokens(lexer.tokenize(), document)
 
         return document
 
-    def _parse_tokens(self, tokens: list[Token], document: Document) -> None:
-        """Parse tokens into document structure"""
-        i = 0
+    def _parse_tokens(self, tokens: Iterable[Token], document: Document) -> None:
+        """
+        Parse tokens into document structure.
+
+        Tokens are consumed as they are produced; only the current
+        section's tokens are buffered.
+        """
         current_section_path = ""
         current_is_absolute = True
-        section_start = 0
-
-        while i < len(tokens):
-            token = tokens[i]
+        section_tokens: list[Token] = []
+        append = section_tokens.append
 
-            if token.line_type in (LineType.ABSOLUTE_HEADER, LineType.RELATIVE_HEADER):
+        for token in tokens:
+            if token.line_type & _HEADER_MASK:
                 # Process previous section if any
-                if i > section_start:
-                    section_tokens = tokens[section_start:i]
+                if section_tokens:
                     self._process_section(
                         section_tokens,
                         current_section_path,
                         current_is_absolute,
                         document,
                     )
+                    section_tokens = []
+                    append = section_tokens.append
 
                 # Start new section
                 current_section_path = token.path or ""
                 current_is_absolute = token.is_absolute or False
-                section_start = i + 1
-
-            i += 1
+            else:
+                append(token)
 
         # Process final section
-        if section_start < len(tokens):
-            section_tokens = tokens[section_start:]
+        if section_tokens:
             self._process_section(
                 section_tokens,
                 current_section_path,
@@ -96,116 +125,96 @@ class Parser:
         document: Document,
     ) -> None:
         """Process a section's tokens"""
-        if not tokens:
-            return
+        # One pass classifies the section and collects its values:
+        # scalar lines, and key/value pairs grouped into blank-separated blocks
+        scalars: list[str] = []
+        blocks: list[list[tuple[str, Any]]] = []
+        pairs: list[tuple[str, Any]] = []
+        has_key_value = False
+        found_content = False
+        blank_after_content = False
+        has_blank_separators = False
 
-        # Filter out blank lines for analysis
-        content_tokens = [t for t in tokens if t.line_type != LineType.BLANK]
-        if not content_tokens:
-            return
+        # Bind hot-loop lookups locally
+        infer = self._infer_type
+        collect_multiline = self._collect_multiline
+        add_scalar = scalars.append
+        add_pair = pairs.append
+
+        i = 0
+        count = len(tokens)
+        while i < count:
+            token = tokens[i]
+            line_type = token.line_type
+
+            if line_type == LineType.BLANK:
+                if found_content:
+                    blank_after_content = True
+                if pairs:
+                    blocks.append(pairs)
+                    pairs = []
+                    add_pair = pairs.append
+            elif line_type & _CONTENT_MASK:
+                has_key_value = True
+                found_content = True
+                if blank_after_content:
+                    # Content on both sides of a blank line
+                    has_blank_separators = True
 
-        # Determine section type
-        has_key_value = any(
-            t.line_type in (LineType.KEY_VALUE, LineType.MULTILINE_START)
-            for t in content_tokens
-        )
+                if line_type == LineType.KEY_VALUE:
+                    value = infer(token.value)
+                else:
+                    # Collect multiline value
+                    value, i = collect_multiline(tokens, i)
+                if token.key:
+                    add_pair((token.key, value))
+            elif token.value is not None:
+                add_scalar(token.value)
+
+            i += 1
+
+        if pairs:
+            blocks.append(pairs)
 
         if not has_key_value:
+            if not scalars:
+                return
+
             # Scalar array
-            values = [self._infer_type(t.value) for t in content_tokens if t.value is not None]
+            values = self._infer_batch(scalars)
             if is_absolute:
                 document.set(section_path, values)
             else:
                 document.add_relative_section(section_path, values)
+        elif has_blank_separators:
+            # Object array, one flat object per block
+            objects = [dict(block) for block in blocks]
+            if is_absolute:
+                document.set(section_path, objects)
+            else:
+                document.add_relative_section(section_path, objects)
+        elif is_absolute and not blocks:
+            # Only empty keys, so there is nothing to attach
+            return
         else:
-            # Check for object array (has blank line separators)
-            if self._has_blank_line_separators(tokens):
-                # Object array
-                objects = self._parse_object_array(tokens)
-                if is_absolute:
-                    document.set(section_path, objects)
+            # Plain object
+            obj: dict[str, Any] = {}
+            set_nested_value = self._set_nested_value
+            for block in blocks:
+                for key, value in block:
+                    set_nested_value(obj, key, value)
+
+            if is_absolute:
+                if all(key and '"' not in key for key in obj):
+                    # Merge the whole section dict with one path walk
+                    document.merge_at_path(section_path, obj)
                 else:
-                    document.add_relative_section(section_path, objects)
-            else:
-                # Plain object
-                obj = self._parse_object(tokens)
-                if is_absolute:
+                    # Quoted or empty keys are resolved as paths
                     for key, value in obj.items():
                         full_path = f"{section_path}.{key}" if section_path else key
                         document.merge_at_path(full_path, value)
-                else:
-                    document.add_relative_section(section_path, obj)
-
-    def _has_blank_line_separators(self, tokens: list[Token]) -> bool:
-        """Check if tokens have blank lines separating key-value blocks"""
-        has_blank = False
-        has_content_after_blank = False
-
-        found_content = False
-        for token in tokens:
-            if token.line_type == LineType.BLANK:
-                if found_content:
-                    has_blank = True
-                    found_content = False
-            elif token.line_type in (LineType.KEY_VALUE, LineType.MULTILINE_START):
-                if has_blank:
-                    has_content_after_blank = True
-                found_content = True
-
-        return has_blank and has_content_after_blank
-
-    def _parse_object_array(self, tokens: list[Token]) -> list[dict[str, Any]]:
-        """Parse tokens as an array of objects"""
-        objects = []
-        current_object: dict[str, Any] = {}
-
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-
-            if token.line_type == LineType.BLANK:
-                if current_object:
-                    objects.append(current_object)
-                    current_object = {}
-            elif token.line_type == LineType.KEY_VALUE:
-                key, value = token.key, token.value
-                if key:
-                    current_object[key] = self._infer_type(value)
-            elif token.line_type == LineType.MULTILINE_START:
-                # Collect multiline value
-                value, i = self._collect_multiline(tokens, i)
-                if token.key:
-                    current_object[token.key] = value
-
-            i += 1
-
-        # Don't forget last object
-        if current_object:
-            objects.append(current_object)
-
-        return objects
-
-    def _parse_object(self, tokens: list[Token]) -> dict[str, Any]:
-        """Parse tokens as a plain object"""
-        obj: dict[str, Any] = {}
-
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-
-            if token.line_type == LineType.KEY_VALUE:
-                key, value = token.key, token.value
-                if key:
-                    self._set_nested_value(obj, key, self._infer_type(value))
-            elif token.line_type == LineType.MULTILINE_START:
-                # Collect multiline value
-                value, i = self._collect_multiline(tokens, i)
-                if token.key:
-                    self._set_nested_value(obj, token.key, value)
-
-            i += 1
-
-        return obj
+            else:
+                document.add_relative_section(section_path, obj)
 
     def _collect_multiline(self, tokens: list[Token], start_idx: int) -> tuple[str, int]:
         """
@@ -214,27 +223,23 @@ class Parser:
         Returns:
             (value, last_index)
         """
-        parts = []
+        # Find the closing token; everything before it is content
+        end_idx = start_idx + 1
+        count = len(tokens)
+        while end_idx < count and tokens[end_idx].line_type != LineType.MULTILINE_END:
+            end_idx += 1
 
         # Add initial content from start token
-        if tokens[start_idx].value:
-            parts.append(tokens[start_idx].value)
-
-        i = start_idx + 1
-        while i < len(tokens):
-            token = tokens[i]
-
-            if token.line_type == LineType.MULTILINE_CONTENT:
-                parts.append(token.value or "")
-            elif token.line_type == LineType.MULTILINE_END:
-                if token.value:
-                    parts.append(token.value)
-                break
-
-            i += 1
+        first = tokens[start_idx].value
+        parts = [first] if first else []
+        parts.extend([token.value or "" for token in tokens[start_idx + 1 : end_idx]])
+        if end_idx < count:
+            last = tokens[end_idx].value
+            if last:
+                parts.append(last)
 
         value = "\n".join(parts)
-        return value, i
+        return value, end_idx
 
     def _set_nested_value(self, obj: dict[str, Any], key: str, value: Any) -> None:
         """
@@ -244,20 +249,20 @@ class Parser:
             "name" -> obj["name"] = value
             "address.city" -> obj["address"]["city"] = value
         """
-        if "." in key:
-            parts = key.split(".")
-            current = obj
-
-            for part in parts[:-1]:
-                if part not in current:
-                    current[part] = {}
-                elif not isinstance(current[part], dict):
-                    current[part] = {}
-                current = current[part]
-
-            current[parts[-1]] = value
-        else:
+        parts = _split_key(key)
+        if parts is None:
             obj[key] = value
+            return
+
+        current = obj
+        for part in parts[:-1]:
+            if part not in current:
+                current[part] = {}
+            elif not isinstance(current[part], dict):
+                current[part] = {}
+            current = current[part]
+
+        current[parts[-1]] = value
 
     def _infer_type(self, value: Optional[str]) -> Any:
         """
@@ -275,26 +280,58 @@ class Parser:
         if not self.infer_types:
             return value
 
-        # Try boolean
-        if value.lower() == "true":
-            return True
-        if value.lower() == "false":
-            return False
+        return _infer_scalar(value)
 
-        # Try integer
-        try:
-            return int(value)
-        except ValueError:
-            pass
+    def _infer_batch(self, values: list[str]) -> list[Any]:
+        """
+        Infer types for all values of a scalar array section.
+
+        Args:
+            values: String values to infer types from
 
-        # Try float
+        Returns:
+            List of typed values
+        """
+        if not self.infer_types:
+            return values
+        return list(map(_infer_scalar, values))
+
+
+@functools.lru_cache(maxsize=8192)
+def _split_key(key: str) -> Optional[tuple[str, ...]]:
+    """Split a dotted key into interned parts, or None for a plain key (memoized)"""
+    if "." not in key:
+        return None
+    return tuple(sys.intern(part) for part in key.split("."))
+
+
+def _infer_scalar(value: str) -> Any:
+    """Infer int, float or bool from a string, keeping it as str otherwise"""
+    # Dispatch on the first character so most values take one branch
+    first = value[:1]
+    if first in _BOOL_INITIALS:
+        # Only "true"/"false" in any case can match; never numeric
+        if len(value) in (4, 5):
+            boolean = _BOOL_WORDS.get(value.lower())
+            if boolean is not None:
+                return boolean
+        return value
+    if first.isalpha() and first not in _NUMERIC_WORD_INITIALS:
+        return value
+
+    # Try integer, then float. Classifying first avoids raising and
+    # catching ValueError for every non-numeric string.
+    if _INT_RE.fullmatch(value):
         try:
-            return float(value)
+            return int(value)
         except ValueError:
+            # Past the int string-conversion digit limit; float() still converts
             pass
+    if _FLOAT_RE.fullmatch(value):
+        return float(value)
 
-        # Keep as string
-        return value
+    # Keep as string
+    return value
 
 
 def parse(text: str, mode: str = "lenient", infer_types: bool = True) -> Document:
@@ -333,6 +370,23 @@ def parse_file(path: str, mode: str = "lenient", infer_types: bool = True) -> Do
         ADFParseError: If parsing fails in strict mode
         FileNotFoundError: If file doesn't exist
     """
-    file_path = Path(path)
-    text = file_path.read_text(encoding="utf-8")
-    return parse(text, mode=mode, infer_types=infer_types)
+    strict = mode == "strict"
+    parser = Parser(strict=strict, infer_types=infer_types)
+
+    # Map regular files instead of reading them into memory; lines are
+    # decoded as they are tokenized
+    with open(path, "rb") as f:
+        info = os.fstat(f.fileno())
+        if stat.S_ISREG(info.st_mode) and info.st_size > 0:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except OSError:
+                # Some filesystems do not support mapping; read instead
+                pass
+            else:
+                with data:
+                    return parser._parse_lexer(Lexer.from_bytes(data, strict=strict))
+
+        # Empty files, pipes and other special files cannot be mapped
+        contents = f.read()
+    return parser._parse_lexer(Lexer.from_bytes(contents, strict=strict))
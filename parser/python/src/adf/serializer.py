@@ -2,8 +2,39 @@
 Serializer for converting Document back to ADF format
 """
 
-from typing import Any
+import io
+from itertools import repeat
+from typing import Any, Callable, TextIO
 from .document import Document
+from .parser import _BOOL_WORDS, _FLOAT_RE
+
+# Values that need their own section rather than a key = value line
+_COMPLEX_TYPES = (dict, list)
+
+# Characters with meaning in ADF lines
+_SPECIAL_CHARS = frozenset("=#:()")
+
+
+class _LineWriter:
+    """
+    Writes lines to a text stream.
+
+    Lines are separated, not terminated, by newlines, matching a
+    "\\n".join() of the same lines.
+    """
+
+    __slots__ = ("_write", "started")
+
+    def __init__(self, fp: TextIO) -> None:
+        self._write = fp.write
+        self.started = False
+
+    def __call__(self, line: str) -> None:
+        if self.started:
+            self._write("\n")
+        else:
+            self.started = True
+        self._write(line)
 
 
 class Serializer:
@@ -28,26 +59,36 @@ class Serializer:
         Returns:
             ADF-formatted text
         """
-        lines = []
+        out = io.StringIO()
+        self.serialize_to(document, out)
+        return out.getvalue()
+
+    def serialize_to(self, document: Document, fp: TextIO) -> None:
+        """
+        Serialize a Document as ADF text directly to a file-like object.
+
+        Args:
+            document: Document to serialize
+            fp: Text stream to write to
+        """
+        write = _LineWriter(fp)
         root_data = document.to_dict()
 
         # Serialize absolute sections
-        self._serialize_dict(root_data, "", lines, is_absolute=True)
+        self._serialize_dict(root_data, "", write, is_absolute=True)
 
         # Serialize relative sections
         relative = document.get_relative_sections()
         if relative:
-            if lines:
-                lines.append("")  # Blank line before relative sections
-            self._serialize_dict(relative, "", lines, is_absolute=False)
-
-        return "\n".join(lines)
+            if write.started:
+                write("")  # Blank line before relative sections
+            self._serialize_dict(relative, "", write, is_absolute=False)
 
     def _serialize_dict(
         self,
         data: dict[str, Any],
         parent_path: str,
-        lines: list[str],
+        write: Callable[[str], None],
         is_absolute: bool,
     ) -> None:
         """
@@ -56,86 +97,88 @@ class Serializer:
         Args:
             data: Dictionary to serialize
             parent_path: Parent path for this data
-            lines: List to append output lines to
+            write: Callable that writes one output line
             is_absolute: Whether this is an absolute or relative section
         """
         for key, value in data.items():
-            current_path = f"{parent_path}.{key}" if parent_path else key
+            current_path = parent_path + "." + key if parent_path else key
 
             if isinstance(value, dict):
                 # Check if it's a simple object or nested structure
                 if self._is_simple_object(value):
                     # Write as section with key-value pairs
-                    self._write_section_header(current_path, lines, is_absolute)
-                    self._write_object(value, lines)
-                    lines.append("")  # Blank line after section
+                    self._write_section_header(current_path, write, is_absolute)
+                    self._write_object(value, write)
+                    write("")  # Blank line after section
                 else:
                     # Recursively handle nested structure
-                    self._serialize_dict(value, current_path, lines, is_absolute)
+                    self._serialize_dict(value, current_path, write, is_absolute)
 
             elif isinstance(value, list):
                 # Write array section
-                self._write_section_header(current_path, lines, is_absolute)
-                self._write_array(value, lines)
-                lines.append("")  # Blank line after section
+                self._write_section_header(current_path, write, is_absolute)
+                self._write_array(value, write)
+                write("")  # Blank line after section
 
             else:
                 # Scalar value at top level - write as section with value
-                self._write_section_header(current_path, lines, is_absolute)
-                self._write_value(key, value, lines)
-                lines.append("")
+                self._write_section_header(current_path, write, is_absolute)
+                self._write_value(key, value, write)
+                write("")
 
     def _is_simple_object(self, obj: dict[str, Any]) -> bool:
         """Check if an object is simple (no nested dicts or arrays)"""
-        for value in obj.values():
-            if isinstance(value, (dict, list)):
-                return False
-        return True
+        return not any(isinstance(value, _COMPLEX_TYPES) for value in obj.values())
 
-    def _write_section_header(self, path: str, lines: list[str], is_absolute: bool) -> None:
+    def _write_section_header(
+        self,
+        path: str,
+        write: Callable[[str], None],
+        is_absolute: bool,
+    ) -> None:
         """Write a section header"""
         prefix = "# " if is_absolute else ""
         if path:
-            lines.append(f"{prefix}{path}:")
+            write(f"{prefix}{path}:")
         else:
-            lines.append(f"{prefix}:")
+            write(f"{prefix}:")
 
-    def _write_object(self, obj: dict[str, Any], lines: list[str]) -> None:
+    def _write_object(self, obj: dict[str, Any], write: Callable[[str], None]) -> None:
         """Write an object's key-value pairs"""
+        write_value = self._write_value
         for key, value in obj.items():
-            self._write_value(key, value, lines)
+            write_value(key, value, write)
 
-    def _write_array(self, arr: list[Any], lines: list[str]) -> None:
+    def _write_array(self, arr: list[Any], write: Callable[[str], None]) -> None:
         """Write an array"""
         if not arr:
             return
 
-        # Check if it's a scalar array or object array
-        if all(not isinstance(item, dict) for item in arr):
-            # Scalar array
-            for item in arr:
-                lines.append(str(item))
+        # Check if it's a scalar array or object array: probe the first item,
+        # then scan with a C-level map since any dict makes an object array
+        if type(arr[0]) is not dict and not any(map(isinstance, arr, repeat(dict))):
+            # Scalar array, written as one multi-line chunk
+            write("\n".join(map(str, arr)))
         else:
             # Object array
+            write_object = self._write_object
             for i, item in enumerate(arr):
                 if i > 0:
-                    lines.append("")  # Blank line between objects
+                    write("")  # Blank line between objects
                 if isinstance(item, dict):
-                    self._write_object(item, lines)
+                    write_object(item, write)
                 else:
-                    lines.append(str(item))
+                    write(str(item))
 
-    def _write_value(self, key: str, value: Any, lines: list[str]) -> None:
+    def _write_value(self, key: str, value: Any, write: Callable[[str], None]) -> None:
         """Write a key-value pair"""
         if isinstance(value, str) and "\n" in value:
             # Multiline value
-            lines.append(f'{key} = """')
-            lines.append(value)
-            lines.append('"""')
+            write(f'{key} = """\n{value}\n"""')
         else:
             # Simple value
             value_str = self._format_value(value)
-            lines.append(f"{key} = {value_str}")
+            write(f"{key} = {value_str}")
 
     def _format_value(self, value: Any) -> str:
         """Format a value for output"""
@@ -156,21 +199,13 @@ class Serializer:
             return True
 
         # Check if looks like a type we'd infer
-        if s.lower() in ("true", "false"):
+        if len(s) in (4, 5) and s.lower() in _BOOL_WORDS:
             return True
-
-        try:
-            float(s)
+        if _FLOAT_RE.fullmatch(s):
             return True
-        except ValueError:
-            pass
 
         # Check for special characters that might need quoting
-        special_chars = ["=", "#", ":", "(", ")"]
-        if any(char in s for char in special_chars):
-            return True
-
-        return False
+        return not _SPECIAL_CHARS.isdisjoint(s)
 
 
 # Add serialize method to Document
@@ -2,8 +2,11 @@
 Basic parsing tests for ADF parser
 """
 
+import os
+import threading
+
 import pytest
-from adf import parse, Document
+from adf import parse, parse_file, Document
 
 
 def test_simple_key_value():
@@ -115,6 +118,33 @@ ratio = 0.5
     assert isinstance(doc.get("pi"), float)
 
 
+def test_type_inference_keeps_non_numeric_whitespace():
+    """Test that separators int()/float() reject leave values as strings"""
+    doc = parse('# a:\nk = "\x1f1.5"\nn = " 7 "\n')
+    assert doc.get("a.k") == "\x1f1.5"
+    assert doc.get("a.n") == 7
+
+
+def test_type_inference_falls_back_to_float_past_int_digit_limit():
+    """Test that integers too long for int() are converted by float()"""
+    doc = parse("# a:\nk = " + "1" * 5000 + "\n")
+    assert doc.get("a.k") == float("inf")
+
+
+def test_type_inference_keeps_non_ascii_float_words():
+    """Test that dotted/dotless i in inf/nan words leave values as strings"""
+    doc = parse('# a:\nk = -\u0130nf\nm = inf\u0130nity\nn = " \u0131nf"\no = -INF\n')
+    assert doc.get("a.k") == "-\u0130nf"
+    assert doc.get("a.m") == "inf\u0130nity"
+    assert doc.get("a.n") == " \u0131nf"
+    assert doc.get("a.o") == float("-inf")
+
+    from adf.serializer import Serializer
+
+    assert not Serializer()._needs_quoting("\u0130nf")
+    assert Serializer()._needs_quoting("-INF")
+
+
 def test_type_inference_booleans():
     """Test type inference for booleans"""
     text = """
@@ -217,3 +247,147 @@ host.backup = backup.example.com
     doc = parse(text)
     assert doc.get("server.host.primary") == "localhost"
     assert doc.get("server.host.backup") == "backup.example.com"
+
+
+def test_quoted_path_access():
+    """Test get/set with quoted path segments"""
+    doc = Document()
+    doc.set('"Some Key".sub', 1)
+    doc.set('"a.b".c', 2)
+    assert doc.get('"Some Key".sub') == 1
+    assert doc.get("Some Key") == {"sub": 1}
+    assert doc.get('"a.b".c') == 2
+    assert doc.get("a.b") is None
+
+
+def test_document_merge():
+    """Test merging one document into another"""
+    base = parse("""
+# app:
+name = Demo
+port = 80
+
+# app.tags:
+a
+b
+""")
+    overlay = parse("""
+# app:
+port = 8080
+debug = true
+
+# app.tags:
+c
+""")
+    base.merge(overlay)
+    assert base.get("app.name") == "Demo"
+    assert base.get("app.port") == 8080
+    assert base.get("app.debug") is True
+    assert base.get("app.tags") == ["c"]
+
+
+def test_to_dict_keeps_values():
+    """Test that to_dict copies containers without converting values"""
+    doc = Document()
+    doc.set("t", (1, 2))
+    doc.set("m", {1: "x"})
+    data = doc.to_dict()
+    assert data == {"t": (1, 2), "m": {1: "x"}}
+
+    data["m"][1] = "y"
+    assert doc.get("m") == {1: "x"}
+
+
+def test_get_after_set():
+    """Test that repeated gets see later updates"""
+    doc = parse("""
+# server:
+port = 80
+""")
+    assert doc.get("server.port") == 80
+    doc.set("server.port", 8080)
+    assert doc.get("server.port") == 8080
+    doc.merge_at_path("server", {"port": 9090})
+    assert doc.get("server.port") == 9090
+    assert doc.get("server.host", "localhost") == "localhost"
+
+
+def test_merge_at_path():
+    """Test merging into a path, creating and replacing containers"""
+    doc = parse("""
+# server:
+port = 80
+""")
+    assert doc.get("server.options.tls") is None
+    doc.merge_at_path("server.options", {"tls": True})
+    assert doc.get("server.options.tls") is True
+    doc.merge_at_path("server", {"options": {"ciphers": "modern"}, "port": 8080})
+    assert doc.get("server") == {
+        "port": 8080,
+        "options": {"tls": True, "ciphers": "modern"},
+    }
+
+    doc.merge_at_path("server.port", {"number": 443})
+    assert doc.get("server.port") == {"number": 443}
+    doc.merge_at_path("server.options", "none")
+    assert doc.get("server.options") == "none"
+
+
+def test_serialize_to_file(tmp_path):
+    """Test serializing to a file matches serialize()"""
+    from adf.serializer import Serializer
+
+    doc = parse("""
+# server:
+host = localhost
+port = 8080
+
+# server.ports:
+80
+443
+""")
+    path = tmp_path / "out.adf"
+    with open(path, "w", encoding="utf-8") as fp:
+        Serializer().serialize_to(doc, fp)
+    assert path.read_text(encoding="utf-8") == doc.serialize()
+
+
+def test_section_with_only_empty_keys():
+    """Test that an absolute section with only empty keys adds nothing"""
+    doc = parse("""
+# a.b:
+ = 3
+""")
+    assert doc.to_dict() == {}
+
+
+def test_parse_file_line_endings(tmp_path):
+    """Test parse_file with CRLF line endings and an empty file"""
+    path = tmp_path / "crlf.adf"
+    path.write_bytes("# app:\r\nname = Café\r\nport = 80\r\n".encode("utf-8"))
+    doc = parse_file(str(path))
+    assert doc.get("app.name") == "Café"
+    assert doc.get("app.port") == 80
+
+    empty = tmp_path / "empty.adf"
+    empty.write_bytes(b"")
+    assert parse_file(str(empty)).to_dict() == {}
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires named pipes")
+def test_parse_file_named_pipe(tmp_path):
+    """Test parse_file on a named pipe, which cannot be memory-mapped"""
+    path = tmp_path / "pipe.adf"
+    os.mkfifo(path)
+
+    def write():
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write("# app:\nport = 80\n")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        doc = parse_file(str(path))
+    finally:
+        writer.join()
+    assert doc.get("app.port") == 80